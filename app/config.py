@@ -11,5 +11,7 @@ URL_AUTH = os.getenv("URL_AUTH")
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL")
 OLLAMA_DEFAULT_MODEL = os.getenv("OLLAMA_DEFAULT_MODEL")
+# How long Ollama keeps the model loaded after a request
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
 TESTING_MODE = os.getenv("TESTING_MODE", "false").lower() == "true"
 DEV_MODE = os.getenv("DEV_MODE", "false").lower() == "true"
\ No newline at end of file
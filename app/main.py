@@ -15,6 +15,7 @@ from fastapi.middleware.cors import CORSMiddleware
 ##//TODO remove the app. before deploying 
 from app.schemas.translation import HealthResponse
 from app.utils.ollama_services import ollama_service
+from app.utils.auth import aclose_google_client
 from app.config import ALLOWED_ORIGINS, CORS_METHODS, CORS_ALLOW_HEADERS
 from app.routers import resume_router, translate_router
 
@@ -33,11 +34,16 @@ async def lifespan(app: FastAPI):
         print("⚠️  Warning: Ollama service is not accessible")
     else:
         print("✅ Connected to Ollama successfully!")
+        # Warm up the model so the first translation doesn't wait for it to load
+        if await ollama_service.preload_model():
+            print("✅ Ollama model loaded")
     
     yield
     
     # Shutdown: Cleanup if needed
     print("🔄 Shutting down...")
+    await ollama_service.aclose()
+    await aclose_google_client()
 
 
 # Create FastAPI application
@@ -22,6 +22,7 @@
 # management of user accounts and their associated data.
 # ==============================================================================
 
+import logging
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.schemas.translation import ResumeRequest, ResumeResponse
 from app.services.resume import resume_service
@@ -32,6 +33,8 @@ from app.schemas.testUser import GoogleUser
 # from utils.auth import verify_user_access
 # from schemas.testUser import GoogleUser
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # ===========================================================================
@@ -58,13 +61,13 @@ async def resume_text(
     """
     try:
         # Process summarization through service layer
-        print(f"DEBUG: Resume request: {request}")
+        logger.debug("Resume request: %s", request)
         response = await resume_service.summarize(request)
-        print(f"DEBUG: Resume successful: {response}")
+        logger.debug("Resume successful: %s", response)
         return response
         
     except Exception as e:
-        print(f"DEBUG: Resume failed: {str(e)}")
+        logger.debug("Resume failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Resume failed: {str(e)}"
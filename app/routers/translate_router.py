@@ -22,6 +22,7 @@
 # management of user accounts and their associated data.
 # ==============================================================================
 
+import logging
 from fastapi import APIRouter, HTTPException, status, Depends
 # import uvicorn
 # import os
@@ -35,6 +36,8 @@ from app.services.translation import translation_service
 from app.utils.auth import verify_user_access
 from app.schemas.testUser import GoogleUser
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # ===========================================================================
@@ -62,11 +65,11 @@ async def translate_text(
     try:
         # Process translation through service layer
         response = await translation_service.translate(request)
-        print(f"DEBUG: Translation successful: {response}")
+        logger.debug("Translation successful: %s", response)
         return response
         
     except Exception as e:
-        print(f"DEBUG: Translation failed: {str(e)}")
+        logger.debug("Translation failed: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Translation failed: {str(e)}"
@@ -7,6 +7,8 @@ Coordinates between authentication, text processing, and Ollama communication
 # from utils.ollama_services import ollama_service
 # from utils.create_prompt_translation import create_prompt_translation
 # from schemas.translation import TranslationRequest, TranslationResponse
+import asyncio
+import logging
 import re
 ##//TODO remove app before deploying 
 from app.utils.sanitize_html import sanitize_html
@@ -15,6 +17,13 @@ from app.utils.sanitize_text import sanitize_text
 from app.utils.create_prompt_translation import create_prompt_translation
 from app.schemas.translation import TranslationRequest, TranslationResponse
 
+logger = logging.getLogger(__name__)
+
+# Field labels of the plain text translation response, compiled once at import instead of per request
+_TITLE_RE = re.compile(r'T[ií]tulo:([^\n]*)', re.IGNORECASE)
+_BODY_RE = re.compile(r'Cuerpo:([^\n]*)', re.IGNORECASE)
+_SECTION_RE = re.compile(r'Secci[oó]n:([^\n]*)', re.IGNORECASE)
+
 
 class TranslationService:
     """Service class for handling translation business logic"""
@@ -42,14 +51,11 @@ class TranslationService:
             has_html = any('<' in text and '>' in text for text in [request.title, request.body, request.section])
             if has_html:
                 # If HTML, translate each field separately (Ollama likely needs to preserve tags)
-                translated_title = await ollama_service.translate_html_content(
-                    request.title, request.target_language, request.model
-                )
-                translated_body = await ollama_service.translate_html_content(
-                    request.body, request.target_language, request.model
-                )
-                translated_section = await ollama_service.translate_html_content(
-                    request.section, request.target_language, request.model
+                # The fields don't depend on each other, so the three translations run concurrently
+                translated_title, translated_body, translated_section = await asyncio.gather(
+                    ollama_service.translate_html_content(request.title, request.target_language, request.model),
+                    ollama_service.translate_html_content(request.body, request.target_language, request.model),
+                    ollama_service.translate_html_content(request.section, request.target_language, request.model)
                 )
                 # Sanitize only for malicious content, not for structure
                 translated_title = sanitize_text(translated_title)
@@ -68,25 +74,25 @@ class TranslationService:
                     section=sanitized_section,
                     target_language=sanitized_target_language
                 )
-                print(f"DEBUG: Generated prompt for translation: {prompt}")
+                logger.debug("Generated prompt for translation: %s", prompt)
                 # Get translation from Ollama (single call)
                 raw_translation = await ollama_service.generate_translation(
                     prompt=prompt,
                     model=request.model
                 )
-                print(f"DEBUG: Raw translation response: {raw_translation}")
+                logger.debug("Raw translation response: %s", raw_translation)
                 # Try to parse the response into fields (assuming format: Título: ... Cuerpo: ... Sección: ...)
                 sanitized = sanitize_text(raw_translation)
                 translated_title, translated_body, translated_section = None, None, None
                 try:
-                    title_match = re.search(r'T[ií]tulo:([^\n]*)', sanitized, re.IGNORECASE)
-                    body_match = re.search(r'Cuerpo:([^\n]*)', sanitized, re.IGNORECASE)
-                    section_match = re.search(r'Secci[oó]n:([^\n]*)', sanitized, re.IGNORECASE)
+                    title_match = _TITLE_RE.search(sanitized)
+                    body_match = _BODY_RE.search(sanitized)
+                    section_match = _SECTION_RE.search(sanitized)
                     translated_title = title_match.group(1).strip() if title_match else ''
                     translated_body = body_match.group(1).strip() if body_match else ''
                     translated_section = section_match.group(1).strip() if section_match else ''
                 except Exception as e:
-                    print(f"DEBUG: Parsing failed with error: {e}")
+                    logger.debug("Parsing failed with error: %s", e)
                     translated_title = sanitized
                     translated_body = ''
                     translated_section = ''
@@ -94,12 +100,10 @@ class TranslationService:
                 translated_title = sanitize_text(translated_title)
                 translated_body = sanitize_text(translated_body)
                 translated_section = sanitize_text(translated_section)
-            print("==="*40)
-            print(f"DEBUG: BEFORE RETURN TO CRM, Final translated fields")
-            print(f"DEBUG- Title: {translated_title}, ")
-            print(f"DEBUG- Body: {translated_body}, ")
-            print(f"DEBUG- Section: {translated_section}")
-            print("==="*40)
+            logger.debug(
+                "Final translated fields: title=%s body=%s section=%s",
+                translated_title, translated_body, translated_section
+            )
             # Return a real dict for translated_text
             return TranslationResponse(
                 translated_text={
@@ -17,6 +17,16 @@ load_dotenv()
 # Security scheme
 security = HTTPBearer()
 
+# Both token checks hit googleapis.com back to back, one client lets the userinfo call
+# reuse the connection the tokeninfo call just opened
+_google_client = httpx.AsyncClient()
+
+
+async def aclose_google_client() -> None:
+    """
+    Release the connections kept open to googleapis.com, used by the app lifespan
+    """
+    await _google_client.aclose()
 
 
 async def verify_google_access_token(credentials: HTTPAuthorizationCredentials = Depends(security)) -> GoogleUser:
@@ -39,40 +49,38 @@ async def verify_google_access_token(credentials: HTTPAuthorizationCredentials =
         print(f"DEBUG: Received token: {token[:50]}..." if len(token) > 50 else f"DEBUG: Received token: {token}")
         print(f"DEBUG: Token type: Google Access Token")
         # Validate Google access token using Google's tokeninfo endpoint
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"https://www.googleapis.com/oauth2/v1/tokeninfo?access_token={token}")
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid Google access token",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            token_info = response.json()
-            # Verify the token audience (client_id) if available
-            if GOOGLE_CLIENT_ID and token_info.get("audience") != GOOGLE_CLIENT_ID:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token not issued for this client",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-        # For access tokens, we need to get user info separately
-        async with httpx.AsyncClient() as client:
-            user_response = await client.get(
-                f"https://www.googleapis.com/oauth2/v2/userinfo?access_token={token}"
+        response = await _google_client.get(f"https://www.googleapis.com/oauth2/v1/tokeninfo?access_token={token}")
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid Google access token",
+                headers={"WWW-Authenticate": "Bearer"},
             )
-            if user_response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Could not fetch user information",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
-            user_info = user_response.json()
-            return GoogleUser(
-                user_id=str(user_info.get("id", "")),
-                email=str(user_info.get("email", "")),
-                name=str(user_info.get("name", "")),
-                verified=bool(user_info.get("verified_email", False))
+        token_info = response.json()
+        # Verify the token audience (client_id) if available
+        if GOOGLE_CLIENT_ID and token_info.get("audience") != GOOGLE_CLIENT_ID:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token not issued for this client",
+                headers={"WWW-Authenticate": "Bearer"},
             )
+        # For access tokens, we need to get user info separately
+        user_response = await _google_client.get(
+            f"https://www.googleapis.com/oauth2/v2/userinfo?access_token={token}"
+        )
+        if user_response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not fetch user information",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_info = user_response.json()
+        return GoogleUser(
+            user_id=str(user_info.get("id", "")),
+            email=str(user_info.get("email", "")),
+            name=str(user_info.get("name", "")),
+            verified=bool(user_info.get("verified_email", False))
+        )
     except httpx.RequestError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -2,13 +2,95 @@
 Ollama service for handling communication with Ollama container
 Manages all interactions with the Ollama translation service with HTML preservation
 """
+import asyncio
+import hashlib
 import httpx
+import logging
+import orjson
 import re
+from cachetools import TTLCache
+from html import escape
 from typing import List, Tuple, Match, Optional, Dict, Any
-from bs4 import BeautifulSoup, NavigableString, Tag
+try:
+    # Optional C-backed parser, extraction falls back to BeautifulSoup without it
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 # from config import OLLAMA_BASE_URL, OLLAMA_DEFAULT_MODEL
 ##//TODO remove app before deploying 
-from app.config import OLLAMA_BASE_URL, OLLAMA_DEFAULT_MODEL
+from app.config import OLLAMA_BASE_URL, OLLAMA_DEFAULT_MODEL, OLLAMA_KEEP_ALIVE
+
+logger = logging.getLogger(__name__)
+
+# HTML void elements, rebuilt as self-closing tags without content
+_VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'})
+
+# Elements whose content is raw text, entities aren't decoded there so their text is put back unescaped
+_RAW_TEXT_TAGS = frozenset({'script', 'style'})
+
+# Table parts, columns and framesets, the HTML5 tree builder behind selectolax drops or moves them when they
+# are outside their usual context (e.g. a bare <tr>) and adds a <tbody> to tables, BeautifulSoup keeps them as written
+_CONTEXT_SENSITIVE_TAG_RE = re.compile(r'<(?:table|caption|colgroup|col|thead|tbody|tfoot|tr|td|th|frameset)[\s/>]', re.IGNORECASE)
+
+# Translation table used to escape attribute values when rebuilding tags
+_ATTR_ESCAPE = str.maketrans({'&': '&amp;', '"': '&quot;', '<': '&lt;'})
+
+# The instruction prompts below are sent as the chat system message while the text to translate
+# goes in the user message, so Ollama can reuse the already processed instructions between calls
+
+# Instructions for HTML chunk translation
+_HTML_TRANSLATION_PROMPT = """You are an AI specialized in translating to {target_language}, accordingly translate the text of the user message by following the next list of rules:
+Rules:
+- Do not add explanations or extra text, no alternatives or explanations
+- Maintain the exact same structure
+- Use neutral, formal, and clear {target_language} style
+- In case the text is a list, translate ONLY the text content after each number, once done keep the same numbering if any (1., 2., 3., etc.)
+- Preserve the HTML structure and tags exactly as they are.
+- Translate literally the visible text between the tags.
+- Use style suitable for an educational or explanatory talk. Avoid slang or regional idioms.
+- Return only the translated. Do not wrap it in extra markdown, do not explain, do not say "Here is your translation".
+- Do not return any context array numbers.
+"""
+
+# Delimiter between joined segments, the record separator symbol (U+241E) is unlikely to appear in prose
+_SEGMENT_DELIMITER = "\n\u241e\n"
+# Splits on the delimiter, tolerant to whitespace the model adds around it
+_SEG_SPLIT = re.compile(r'\s*\u241e\s*')
+# Index marker prefixed to each segment so translations can be matched back regardless of order
+_SEG_INDEX_RE = re.compile(r'\[\[(\d+)\]\](.*?)(?=\[\[\d+\]\]|$)', re.DOTALL)
+_SEG_MARKER_RE = re.compile(r'\[\[\d+\]\]')
+
+# Untranslatable attribute values (URLs, styles, ids...) swapped for short placeholders before a chunk
+# goes to the model, so they don't cost prompt and output tokens, and put back afterwards
+_MASKED_ATTR_RE = re.compile(r'''(\s(?:src|srcset|href|style|class|id|data-[\w-]+)\s*=\s*)("[^"]*"|'[^']*')''', re.IGNORECASE)
+_ATTR_PLACEHOLDER_RE = re.compile(r'__ATTR_(\d+)__')
+# Values this short aren't worth a placeholder
+_MIN_MASKED_ATTR_LEN = 12
+
+# Instructions for translating joined segments in one call
+_JOINED_TRANSLATION_PROMPT = """Translate the text segments of the user message to {target_language}.
+- Use only one translation, no alternatives or explanations.
+- Preserve the HTML structure and tags exactly as they are.
+- Use a neutral, formal, and clear {target_language} style — suitable for an educational or explanatory talk. Avoid slang or regional idioms.
+- Return only the translated segments. Do not wrap them in extra markdown, do not explain, do not say "Here is your translation".
+- Segments are separated by lines containing only the \u241e character. Keep every separator line and every [[number]] marker exactly as they are.
+"""
+
+# Instructions for translating a JSON array of segments in one call
+_BATCH_TRANSLATION_PROMPT = """Translate each item of the JSON array in the user message to {target_language}.
+- Use only one translation per item, no alternatives or explanations.
+- Keep any HTML tags exactly as they are.
+- Return a JSON object of the form {{"translations": ["...", "..."]}} with exactly one translated string per item, in the same order.
+"""
+
+
+def _attr_value_to_str(attr_value: Any) -> str:
+    """Convert a parsed attribute value (str, list of classes or None) to its string form"""
+    if isinstance(attr_value, list):
+        return ' '.join(str(item) for item in attr_value)  # type: ignore
+    if attr_value is None:
+        return ''
+    return str(attr_value)
 
 class OllamaService:
     """Service class for interacting with Ollama"""
@@ -16,6 +98,26 @@ class OllamaService:
     def __init__(self):
         self.base_url = OLLAMA_BASE_URL
         self.timeout = 60.0
+        # Shared client so every Ollama call reuses pooled keep-alive connections
+        # and asks for compressed responses (httpx decompresses them transparently)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url or "",
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=32),
+            headers={"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        )
+        # Caps concurrent generate requests so parallel segment translations don't flood Ollama
+        self._sem = asyncio.Semaphore(8)
+        # Generated texts keyed by a hash of the request, repeated prompts skip the LLM call
+        self._cache: TTLCache[bytes, str] = TTLCache(maxsize=10_000, ttl=86400)
+        self._cache_hits = 0
+        self._cache_misses = 0
+
+    async def aclose(self) -> None:
+        """
+        Close the shared HTTP client, called on application shutdown
+        """
+        await self._client.aclose()
     
     async def check_health(self) -> bool:
         """
@@ -25,15 +127,115 @@ class OllamaService:
             True if Ollama is responding, False otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                return response.status_code == 200
+            response = await self._client.get("/api/tags")
+            return response.status_code == 200
         except Exception:
             return False
 
+    async def preload_model(self) -> bool:
+        """
+        Load the default model into Ollama memory, called on application startup
+        A generate request with an empty prompt only loads the model, so the first
+        translation doesn't pay the model load time
+        
+        Returns:
+            True if the model was loaded, False otherwise
+        """
+        try:
+            response = await self._client.post(
+                "/api/generate",
+                json={"model": OLLAMA_DEFAULT_MODEL, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE}
+            )
+            return response.status_code == 200
+        except Exception as e:
+            logger.warning("Model preload failed: %s", e)
+            return False
+
+    def _collect_attribute_text(self, tag_data: Dict[str, Any], attributes: Dict[str, Any], text_segments: List[str]) -> None:
+        """
+        Register translatable attribute text (img alt and title) of a tag as text segments
+        """
+        if tag_data['tag_name'] == 'img':
+            alt_text_attr = attributes.get('alt')
+            if isinstance(alt_text_attr, str):
+                alt_text = alt_text_attr.strip()
+                if alt_text:
+                    placeholder_index = len(text_segments)
+                    text_segments.append(alt_text)
+                    tag_data['alt_placeholder_index'] = placeholder_index
+                    tag_data['original_alt'] = alt_text
+        
+        title_attr = attributes.get('title')
+        if title_attr:
+            if isinstance(title_attr, str):
+                title_text = title_attr.strip()
+                if title_text:
+                    placeholder_index = len(text_segments)
+                    text_segments.append(title_text)
+                    tag_data['title_placeholder_index'] = placeholder_index
+                    tag_data['original_title'] = title_text
+
+    def _extract_text_with_selectolax(self, html_content: str) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Extract translatable text using selectolax (lexbor C engine)
+        Matches the BeautifulSoup path for well-formed fragments, except for table parts and framesets
+        which callers must route to BeautifulSoup (see _CONTEXT_SENSITIVE_TAG_RE)
+        
+        Args:
+            html_content: HTML string with content to translate
+            
+        Returns:
+            Tuple of (list of text segments, structure_map for reconstruction)
+        """
+        tree = LexborHTMLParser(html_content)  # type: ignore
+        text_segments: List[str] = []
+        structure_map: Dict[str, Any] = {
+            'type': 'root',
+            'content': [],
+            'original_html': html_content
+        }
+
+        # The parser moves leading <title>, <meta>, <style>... of fragments into <head>,
+        # so walk it as well unless the input is a full document with its own body
+        roots = [tree.body] if '<body' in html_content.lower() else [tree.head, tree.body]
+        top_nodes = [child for root in roots if root is not None for child in root.iter(include_text=True)]
+
+        # Walk the tree with an explicit stack of (node, parent structure), children pushed
+        # in reverse so they are visited in document order
+        stack: List[Tuple[Any, Dict[str, Any]]] = [(node, structure_map) for node in reversed(top_nodes)]
+        while stack:
+            node, parent_structure = stack.pop()
+            tag_name = node.tag
+            if tag_name == '-text':
+                text = node.text(deep=False).strip()
+                if text:
+                    placeholder_index = len(text_segments)
+                    text_segments.append(text)
+                    parent_structure['content'].append({
+                        'type': 'text',
+                        'placeholder_index': placeholder_index,
+                        'original_text': text
+                    })
+            elif not tag_name.startswith('-'):  # Skip comments and other non-element nodes
+                attributes: Dict[str, Any] = node.attributes
+                tag_data: Dict[str, Any] = {
+                    'type': 'tag',
+                    'tag_name': tag_name,
+                    'attributes': attributes,
+                    'content': []
+                }
+                self._collect_attribute_text(tag_data, attributes, text_segments)
+                parent_structure['content'].append(tag_data)
+                children = list(node.iter(include_text=True))
+                stack.extend((child, tag_data) for child in reversed(children))
+
+        logger.debug("Extracted %s text segments from HTML (selectolax)", len(text_segments))
+        return text_segments, structure_map
+
     def extract_text_with_structure(self, html_content: str) -> Tuple[List[str], Dict[str, Any]]:
         """
         Extract all translatable text from HTML while preserving complete structure for reconstruction
+        Uses selectolax when installed, BeautifulSoup otherwise and for table or frameset markup
         
         Args:
             html_content: HTML string with content to translate
@@ -41,7 +243,14 @@ class OllamaService:
         Returns:
             Tuple of (list of text segments, structure_map for reconstruction)
         """
+        if LexborHTMLParser is not None and not _CONTEXT_SENSITIVE_TAG_RE.search(html_content):
+            try:
+                return self._extract_text_with_selectolax(html_content)
+            except Exception as e:
+                logger.debug("selectolax extraction failed, using BeautifulSoup: %s", e)
         try:
+            # Only this fallback needs BeautifulSoup, so it is imported on first use rather than at startup
+            from bs4 import BeautifulSoup, NavigableString, Tag
             soup = BeautifulSoup(html_content, 'html.parser')  # type: ignore
             text_segments: List[str] = []
             structure_map: Dict[str, Any] = {
@@ -50,7 +259,12 @@ class OllamaService:
                 'original_html': html_content
             }  # type: ignore
             
-            def process_element(element: Any, parent_structure: Dict[str, Any]) -> None:
+            # Process the entire document with an explicit stack of (element, parent structure),
+            # children pushed in reverse so they are visited in document order
+            top_elements = list(soup.body.children if soup.body else soup.children)
+            stack: List[Tuple[Any, Dict[str, Any]]] = [(element, structure_map) for element in reversed(top_elements)]
+            while stack:
+                element, parent_structure = stack.pop()
                 if isinstance(element, NavigableString):
                     text = str(element).strip()
                     if text and not text.isspace():
@@ -63,54 +277,28 @@ class OllamaService:
                             'original_text': text
                         })
                 elif isinstance(element, Tag):
+                    # Copy the attributes once and read alt/title from the local dict
+                    attributes: Dict[str, Any] = dict(element.attrs) if element.attrs else {}
                     tag_data: Dict[str, Any] = {
                         'type': 'tag',
                         'tag_name': element.name,
-                        'attributes': dict(element.attrs) if element.attrs else {},
+                        'attributes': attributes,
                         'content': []
                     }  # type: ignore
                     
                     # Handle special attributes that might contain translatable text
-                    if element.name == 'img' and element.get('alt'):
-                        alt_text_attr = element.get('alt')
-                        if isinstance(alt_text_attr, str):
-                            alt_text = alt_text_attr.strip()
-                            if alt_text:
-                                placeholder_index = len(text_segments)
-                                text_segments.append(alt_text)
-                                tag_data['alt_placeholder_index'] = placeholder_index
-                                tag_data['original_alt'] = alt_text
-                    
-                    title_attr = element.get('title')
-                    if title_attr:
-                        if isinstance(title_attr, str):
-                            title_text = title_attr.strip()
-                            if title_text:
-                                placeholder_index = len(text_segments)
-                                text_segments.append(title_text)
-                                tag_data['title_placeholder_index'] = placeholder_index
-                                tag_data['original_title'] = title_text
-                    
-                    # Process children
-                    for child in element.children:
-                        process_element(child, tag_data)  # type: ignore
-                    
+                    self._collect_attribute_text(tag_data, attributes, text_segments)
                     parent_structure['content'].append(tag_data)  # type: ignore
+                    
+                    # Queue children
+                    stack.extend((child, tag_data) for child in reversed(list(element.children)))  # type: ignore
             
-            # Process the entire document
-            if soup.body:
-                for child in soup.body.children:
-                    process_element(child, structure_map)  # type: ignore
-            else:
-                for child in soup.children:
-                    process_element(child, structure_map)  # type: ignore
-            
-            print(f"DEBUG: Extracted {len(text_segments)} text segments from HTML")
-            print(f"DEBUG: Text segments: {text_segments}")
+            logger.debug("Extracted %s text segments from HTML", len(text_segments))
+            logger.debug("Text segments: %s", text_segments)
             return text_segments, structure_map
             
         except Exception as e:
-            print(f"DEBUG: Error in extract_text_with_structure: {e}")
+            logger.debug("Error in extract_text_with_structure: %s", e)
             # Fallback to old method - convert result to expected format
             text_segments, template = self.extract_text_from_html(html_content)
             fallback_structure_map: Dict[str, Any] = {
@@ -138,22 +326,32 @@ class OllamaService:
                 if isinstance(template, str):
                     return self.reconstruct_html(translated_segments, template)
             
-            def render_content(content_list: List[Dict[str, Any]]) -> str:
-                html_parts: List[str] = []
-                for item in content_list:
-                    if item['type'] == 'text':
-                        # Replace with translated text
-                        index = item['placeholder_index']
-                        if isinstance(index, int) and index < len(translated_segments):
-                            html_parts.append(translated_segments[index])
-                        else:
-                            html_parts.append(str(item.get('original_text', '')))  # Fallback
-                    elif item['type'] == 'tag':
-                        # Reconstruct tag
-                        tag_name = str(item.get('tag_name', ''))
-                        attributes = dict(item.get('attributes', {}))
-                        
-                        # Handle translated attributes
+            # Every fragment goes into a single list joined once at the end. Items are taken
+            # from an explicit stack; a closing tag is queued as a plain string behind the
+            # element's children so it is emitted after them
+            html_parts: List[str] = []
+            stack: List[Any] = list(reversed(structure_map.get('content', [])))
+            while stack:
+                item = stack.pop()
+                if isinstance(item, str):
+                    html_parts.append(item)
+                elif item['type'] == 'text':
+                    # Replace with translated text
+                    index = item['placeholder_index']
+                    if isinstance(index, int) and index < len(translated_segments):
+                        text = translated_segments[index]
+                    else:
+                        text = str(item.get('original_text', ''))  # Fallback
+                    # Segments were entity-decoded on extraction, so "&lt;" must not come back as "<"
+                    html_parts.append(text if item.get('raw_text') else escape(text, quote=False))
+                elif item['type'] == 'tag':
+                    # Reconstruct tag
+                    tag_name = str(item.get('tag_name', ''))
+                    attributes = item.get('attributes') or {}
+                    
+                    # Handle translated attributes, copying the attributes only when one is swapped in
+                    if 'alt_placeholder_index' in item or 'title_placeholder_index' in item:
+                        attributes = dict(attributes)
                         if 'alt_placeholder_index' in item:
                             index = item['alt_placeholder_index']
                             if isinstance(index, int) and index < len(translated_segments):
@@ -163,39 +361,31 @@ class OllamaService:
                             index = item['title_placeholder_index']
                             if isinstance(index, int) and index < len(translated_segments):
                                 attributes['title'] = translated_segments[index]
-                        
-                        # Build attribute string
-                        attr_str = ''
-                        if attributes:
-                            attr_parts: List[str] = []
-                            for key, attr_value in attributes.items():
-                                # Convert attribute value to string regardless of type
-                                if isinstance(attr_value, list):
-                                    # Handle attribute values that are lists
-                                    value_str = ' '.join(str(item) for item in attr_value)  # type: ignore
-                                elif attr_value is not None:
-                                    value_str = str(attr_value)
-                                else:
-                                    value_str = ''
-                                attr_parts.append(f'{key}="{value_str}"')  # type: ignore
-                            attr_str = ' ' + ' '.join(attr_parts)
-                        
-                        # Self-closing tags
-                        if tag_name in ['img', 'br', 'hr', 'input', 'meta', 'link']:
-                            html_parts.append(f'<{tag_name}{attr_str} />')
-                        else:
-                            # Regular tags with content
-                            inner_content = render_content(item.get('content', []))
-                            html_parts.append(f'<{tag_name}{attr_str}>{inner_content}</{tag_name}>')
-                
-                return ''.join(html_parts)
+                    
+                    # Attributes are emitted token by token, values escaped so quotes can't break the markup
+                    html_parts.extend(('<', tag_name))
+                    if attributes:
+                        for key, attr_value in attributes.items():
+                            html_parts.extend((' ', key, '="', _attr_value_to_str(attr_value).translate(_ATTR_ESCAPE), '"'))
+                    
+                    # Self-closing tags
+                    if tag_name in _VOID_TAGS:
+                        html_parts.append(' />')
+                    else:
+                        # Regular tags with content
+                        html_parts.append('>')
+                        stack.append(f'</{tag_name}>')
+                        content = item.get('content', [])
+                        if tag_name in _RAW_TEXT_TAGS:
+                            content = [dict(child, raw_text=True) if child.get('type') == 'text' else child for child in content]
+                        stack.extend(reversed(content))
             
-            result = render_content(structure_map.get('content', []))
-            print(f"DEBUG: Reconstructed HTML: {result}")
+            result = ''.join(html_parts)
+            logger.debug("Reconstructed HTML: %s", result)
             return result
             
         except Exception as e:
-            print(f"DEBUG: Error in reconstruct_html_from_structure: {e}")
+            logger.debug("Error in reconstruct_html_from_structure: %s", e)
             # Fallback to old method
             return self.reconstruct_html(translated_segments, "")
 
@@ -253,8 +443,8 @@ class OllamaService:
                     text_segments.append(end_text)
                     placeholder_template = placeholder_template[:last_tag_match.end()] + placeholder
         
-        print(f"DEBUG: OLD METHOD - Extracted text segments: {text_segments}")
-        print(f"DEBUG: OLD METHOD - Placeholder template: {placeholder_template}")
+        logger.debug("OLD METHOD - Extracted text segments: %s", text_segments)
+        logger.debug("OLD METHOD - Placeholder template: %s", placeholder_template)
         return text_segments, placeholder_template
 
     def reconstruct_html(self, translated_segments: List[str], template: str) -> str:
@@ -274,7 +464,7 @@ class OllamaService:
             placeholder = f"{{TEXT_{i}__}}"
             result = result.replace(placeholder, translated_text)
         
-        print(f"DEBUG: OLD METHOD - Reconstructed HTML: {result}")
+        logger.debug("OLD METHOD - Reconstructed HTML: %s", result)
         return result
     def split_html_into_chunks(self, html: str, max_chars: int = 2000) :
         """
@@ -292,7 +482,13 @@ class OllamaService:
         Returns:
             List of HTML chunks ready for translation
         """
+        # Fast path: short content without <hr> is already a single chunk
+        if len(html) <= max_chars and "<hr" not in html:
+            stripped = html.strip()
+            return [stripped] if stripped else []
+
         final_chunks: list[str] = []
+        max_len = 0  # Longest chunk produced by steps 1 and 2
 
     # Step 1: split by <hr>
         parts = html.split("<hr")
@@ -307,6 +503,7 @@ class OllamaService:
         # Step 2: enforce max length
             if len(part) <= max_chars:
                 final_chunks.append(part)
+                max_len = max(max_len, len(part))
             else:
             # Try splitting further by </div>
                 buffer = ""
@@ -317,11 +514,17 @@ class OllamaService:
                     if len(candidate) > max_chars:
                         if buffer:
                             final_chunks.append(buffer)
+                            max_len = max(max_len, len(buffer))
                         buffer = sub + "</div>"
                     else:
                         buffer = candidate
                 if buffer:
                     final_chunks.append(buffer)
+                    max_len = max(max_len, len(buffer))
+
+        # Every chunk already fits, the safeguard below has nothing to do
+        if max_len <= max_chars:
+            return [c.strip() for c in final_chunks if c.strip()]
 
     # Step 3: safeguard for any chunks still too large
         safe_final: list[str] = []
@@ -331,13 +534,14 @@ class OllamaService:
                 while start < len(chunk):
                     slice_ = chunk[start:start + max_chars]
 
-                # try not to break inside a tag
-                    if slice_.count("<") > slice_.count(">"):
+                # try not to break inside a tag (plain text slices can't contain one)
+                    if '<' in slice_ and slice_.count("<") > slice_.count(">"):
                         cut = slice_.rfind(">")
-                        if cut != -1:
+                        # Without any '>' to cut at, keep the whole slice to make progress
+                        if cut > 0:
                             safe_final.append(slice_[:cut+1])
-                        start += cut + 1
-                        continue
+                            start += cut + 1
+                            continue
 
                     safe_final.append(slice_)
                     start += max_chars
@@ -463,8 +667,7 @@ class OllamaService:
             return content
     
         try:
-            print(f"DEBUG: Starting HTML translation at translate html contentwith improved structure preservation")
-            prompt = ""
+            logger.debug("Starting HTML translation at translate html contentwith improved structure preservation")
             # Extract text segments and structure
             # text_segments, structure_map = self.extract_text_with_structure(content)
             
@@ -478,50 +681,47 @@ class OllamaService:
             # print(f"DEBUG: Clean text for translation:\n{clean_text_for_translation}")
             # print("==="*40)
             chunks = self.split_html_into_chunks(content, max_chars=5000)
+            system_prompt = _HTML_TRANSLATION_PROMPT.format(target_language=target_language)
             translated_chunks: List[str] = []
             for i, chunk in enumerate(chunks):
                 try:
-                # Extract text and structure from chunk
-                    text_segments = self.extract_text_with_structure(chunk)
-                
-                    if not text_segments:
-                        translated_chunks.append(chunk)
-                        continue
+                # Extract text and structure from chunk, plain text chunks skip the HTML parse
+                    if '<' in chunk:
+                        text_segments, _ = self.extract_text_with_structure(chunk)
+                        if not text_segments:
+                            translated_chunks.append(chunk)  # Only markup, nothing to translate
+                            continue
 
-            # Create prompt for translation with numbered segments
-                    prompt = f"""You are an AI specialized in translating to {target_language}, accordingly translate the below text by following the next list of rules:
-                    Rules:
-                    - Do not add explanations or extra text, no alternatives or explanations
-                    - Maintain the exact same structure
-                    - Use neutral, formal, and clear {target_language} style
-                    - In case the text is a list, translate ONLY the text content after each number, once done keep the same numbering if any (1., 2., 3., etc.)
-                    - Preserve the HTML structure and tags exactly as they are.
-                    - Translate literally the visible text between the tags.
-                    - Use style suitable for an educational or explanatory talk. Avoid slang or regional idioms.
-                    - Return only the translated. Do not wrap it in extra mark  down, do not explain, do not say "Here is your translation".
-                    - Do not return any context array numbers.
-                    The text to translate is:
-                    {chunk}"""
-
-                    print(f"DEBUG: Generated prompt for structured translation")
+            # The instructions are the same for every chunk, only the chunk is sent as the prompt
+                    prompt, masked_values = self._mask_attribute_values(chunk)
                 
                 # Get translation
-                    translated_response = await self.generate_translation(prompt, model_to_use)
-                    print("==="*40)
-                    print(f"DEBUG: Raw translation response: {translated_response}")
-                    print("==="*40)
+                    # Output length tracks the prompt length, so cap generation at the prompt size
+                    translated_response = await self.generate_translation(
+                        prompt, model_to_use, num_predict=max(256, len(prompt)), system=system_prompt
+                    )
+                    logger.debug("Raw translation response: %s", translated_response)
+                    if masked_values:
+                        restored = self._unmask_attribute_values(translated_response, masked_values)
+                        if restored is None:
+                            # Placeholders were mangled, translate the chunk with its attributes instead
+                            logger.debug("Attribute placeholders lost in chunk %s, retrying unmasked", i+1)
+                            restored = await self.generate_translation(
+                                chunk, model_to_use, num_predict=max(256, len(chunk)), system=system_prompt
+                            )
+                        translated_response = restored
             # Parse numbered response back to list
             # translated_segments = self._parse_numbered_translation(translated_response, len(text_segments))
                 # Validate translation
                     if not translated_response or len(translated_response.strip()) < 5:
-                        print(f"WARNING: Empty or invalid translation for chunk {i+1}")
+                        logger.warning("Empty or invalid translation for chunk %s", i+1)
                         translated_chunks.append(chunk)  # Keep original if translation failed
                         continue
                     
                     translated_chunks.append(translated_response.strip())
                     
                 except Exception as chunk_error:
-                    print(f"ERROR: Failed to translate chunk {i+1}: {str(chunk_error)}")
+                    logger.error("Failed to translate chunk %s: %s", i+1, chunk_error)
                     translated_chunks.append(chunk)  # Keep original on error
                     continue
             # if len(translated_segments) != len(text_segments):
@@ -538,16 +738,80 @@ class OllamaService:
             # result = self.reconstruct_html_from_structure(translated_segments, structure_map)
                 # translated_chunks.append(translated_response)
             result = "\n".join(translated_chunks)
-            print("==="*40)
-            print(f"DEBUG: Final translated HTML result: {result}")
-            print("==="*40)
+            logger.debug("Final translated HTML result: %s", result)
             return result
             
         except Exception as e:
-            print(f"DEBUG: Error in new structured translation: {e}. Falling back to old method.")
+            logger.debug("Error in new structured translation: %s. Falling back to old method.", e)
             # Fallback to old method if new approach fails
             return await self._translate_html_content_old_method(content, target_language, model_to_use)
 
+    async def translate_html_content_batched(self, content: str, target_language: str, model: Optional[str] = None) -> str:
+        """
+        Translate HTML content by sending all of its text segments in a single prompt
+        Extracts the segments once, translates them joined together and rebuilds the HTML
+        from the structure map, so the markup itself never goes to the model
+        
+        Args:
+            content: HTML content to translate
+            target_language: Target language for translation
+            model: Ollama model to use for translation (defaults to OLLAMA_DEFAULT_MODEL)
+            
+        Returns:
+            Translated HTML content with preserved structure
+        """
+        model_to_use = model if model is not None else OLLAMA_DEFAULT_MODEL or "llama3.2"
+        if not content or len(content.strip()) < 5:
+            return content
+        
+        text_segments, structure_map = self.extract_text_with_structure(content)
+        if not text_segments:
+            return content  # No text to translate
+        
+        # One call for all the segments, falling back to per-segment calls on a count mismatch
+        translated_segments = await self.translate_segments_joined(text_segments, target_language, model_to_use)
+        return self.reconstruct_html_from_structure(translated_segments, structure_map)
+
+    def _mask_attribute_values(self, chunk: str) -> Tuple[str, List[str]]:
+        """
+        Replace long untranslatable attribute values of a chunk with __ATTR_i__ placeholders
+        
+        Returns:
+            The masked chunk and the original values, indexed by placeholder number
+        """
+        values: List[str] = []
+        
+        def mask(match: Match[str]) -> str:
+            quoted = match.group(2)
+            if len(quoted) < _MIN_MASKED_ATTR_LEN:
+                return match.group(0)
+            values.append(quoted[1:-1])
+            quote = quoted[0]
+            return f'{match.group(1)}{quote}__ATTR_{len(values) - 1}__{quote}'
+        
+        return _MASKED_ATTR_RE.sub(mask, chunk), values
+
+    def _unmask_attribute_values(self, text: str, values: List[str]) -> Optional[str]:
+        """
+        Put the original attribute values back in place of their placeholders
+        
+        Returns:
+            The restored text, or None if the model lost or invented a placeholder
+        """
+        found: set = set()
+        
+        def unmask(match: Match[str]) -> str:
+            index = int(match.group(1))
+            if index >= len(values):
+                return match.group(0)
+            found.add(index)
+            return values[index]
+        
+        restored = _ATTR_PLACEHOLDER_RE.sub(unmask, text)
+        if len(found) != len(values) or _ATTR_PLACEHOLDER_RE.search(restored):
+            return None
+        return restored
+
     def _parse_numbered_translation(self, translation_response: str, expected_count: int) -> List[str]:
         """
         Parse numbered translation response back to list of segments
@@ -572,32 +836,43 @@ class OllamaService:
         
         return segments[:expected_count]  # Trim if too many
 
-    # OLD METHOD - PRESERVED FOR FALLBACK
-    async def _translate_html_content_old_method(self, content: str, target_language: str, model: str) -> str:
+    def _parse_segmented_translation(self, translation_response: str, expected_count: int) -> Optional[List[str]]:
         """
-        OLD METHOD: Translate HTML content while preserving structure and tags
-        This method uses the original segment-based approach with ---SEGMENT--- separators
-        """
-        # Extract text segments and create template
-        text_segments, placeholder_template = self.extract_text_from_html(content)
+        Parse a "[[i]]text ␞ [[i+1]]text" response back to a list of segments
+        Uses the index markers first and the separators alone if the markers were lost
         
-        if not text_segments:
-            return content  # No text to translate
-        
-        # Create prompt for batch translation
-        text_to_translate = "---SEGMENT---".join(text_segments)
-        print(f"DEBUG: OLD METHOD - text for translation: {text_to_translate}")
+        Returns:
+            The translated segments in original order, or None if they can't be matched
+        """
+        indexed: Dict[int, str] = {}
+        for index, text in _SEG_INDEX_RE.findall(translation_response):
+            indexed[int(index)] = _SEG_SPLIT.sub(' ', text).strip()
+        if all(i in indexed for i in range(expected_count)):
+            return [indexed[i] for i in range(expected_count)]
         
-        # OLD PROMPT - PRESERVED FOR REFERENCE
-        prompt = f"""Translate the following text segments to {target_language}. 
-Translate the following HTML content into Spanish.
+        parts = _SEG_SPLIT.split(translation_response.strip())
+        if len(parts) == expected_count:
+            return [_SEG_MARKER_RE.sub('', part).strip() for part in parts]
+        return None
 
-- Use only one translation, no alternatives or explanations.
-- Preserve the HTML structure and tags exactly as they are.
-- Translate literally the visible text between the tags.
-- Use a neutral, formal, and clear Spanish style — suitable for an educational or explanatory talk. Avoid slang or regional idioms.
-- Return only the translated HTML. Do not wrap it in extra markdown, do not explain, do not say "Here is your translation".
-{text_to_translate}"""
+    async def translate_segments_joined(self, segments: List[str], target_language: str, model: str) -> List[str]:
+        """
+        Translate several text segments with a single prompt
+        Segments are joined with a delimiter line and split back from the response, falling back
+        to the JSON batch call and finally to one call per segment if they can't be matched
+        
+        Args:
+            segments: Text segments to translate
+            target_language: Target language for translation
+            model: Ollama model to use
+            
+        Returns:
+            Translated segments in the original order
+        """
+        # Create prompt for batch translation, each segment tagged with its index
+        text_to_translate = _SEGMENT_DELIMITER.join(f"[[{i}]]{segment}" for i, segment in enumerate(segments))
+        logger.debug("Joined text for translation: %s", text_to_translate)
+        system_prompt = _JOINED_TRANSLATION_PROMPT.format(target_language=target_language)
         
         # COMMENTED OLD PROMPT IDEAS - PRESERVED FOR FUTURE REFERENCE
         # print(f"DEBUG: Generated prompt for translation: {prompt}")
@@ -609,35 +884,96 @@ Translate the following HTML content into Spanish.
         # - For images, translate only the 'alt' and 'title' text if present
         # - Return the result in the exact same JSON structure
         # Get translation
-        translated_combined = await self.generate_translation(prompt, model)
+        translated_combined = await self.generate_translation(text_to_translate, model, system=system_prompt)
         
         # OLD DEBUG - PRESERVED FOR REFERENCE
         # print(f"DEBUG: Raw translation response: {translated_combined}")
         
         # Split back into segments
-        translated_segments = translated_combined.split("---SEGMENT---")
-        translated_segments = [seg.strip() for seg in translated_segments]
+        translated_segments = self._parse_segmented_translation(translated_combined, len(segments))
         
-        # Ensure we have the same number of segments
-        if len(translated_segments) != len(text_segments):
+        # Ensure we have the same number of segments, retry all of them in a single JSON call first
+        if translated_segments is None:
+            translated_segments = await self.generate_translations_batch(segments, target_language, model)
+        if translated_segments is None:
             # Fallback: translate each segment individually
-            translated_segments: List[str] = []
-            for segment in text_segments:
-                individual_prompt = f"Translate this text to {target_language}: {segment}"
-                translated_segment = await self.generate_translation(individual_prompt, model)
-                translated_segments.append(translated_segment.strip())
+            individual_prompts = [f"Translate this text to {target_language}: {segment}" for segment in segments]
+            translated_segments = [
+                translated_segment.strip()
+                for translated_segment in await asyncio.gather(
+                    *(self.generate_translation(prompt, model) for prompt in individual_prompts)
+                )
+            ]
+        return translated_segments
+
+    # OLD METHOD - PRESERVED FOR FALLBACK
+    async def _translate_html_content_old_method(self, content: str, target_language: str, model: str) -> str:
+        """
+        OLD METHOD: Translate HTML content while preserving structure and tags
+        This method uses the original segment-based approach, translating all segments in one joined prompt
+        """
+        # Extract text segments and create template
+        text_segments, placeholder_template = self.extract_text_from_html(content)
+        
+        if not text_segments:
+            return content  # No text to translate
+        
+        translated_segments = await self.translate_segments_joined(text_segments, target_language, model)
         
         # Reconstruct HTML with translated text
-        print(f"DEBUG: OLD METHOD - HTML with translated content: {self.reconstruct_html(translated_segments, placeholder_template)}")
-        return self.reconstruct_html(translated_segments, placeholder_template)
+        result = self.reconstruct_html(translated_segments, placeholder_template)
+        logger.debug("OLD METHOD - HTML with translated content: %s", result)
+        return result
 
-    async def generate_translation(self, prompt: str, model: str) -> str:
+    async def generate_translations_batch(self, segments: List[str], target_language: str, model: str) -> Optional[List[str]]:
+        """
+        Translate several text segments with a single Ollama call
+        Sends the segments as a JSON array and uses Ollama's JSON output mode to read them back
+        
+        Args:
+            segments: Text segments to translate
+            target_language: Target language for translation
+            model: Ollama model to use
+            
+        Returns:
+            Translated segments in the original order, or None if the response doesn't match
+        """
+        # orjson writes UTF-8 directly, so non-ASCII text stays readable for the model
+        system_prompt = _BATCH_TRANSLATION_PROMPT.format(target_language=target_language)
+        prompt = orjson.dumps(segments).decode()
+        try:
+            response = await self.generate_translation(prompt, model, response_format="json", system=system_prompt)
+            data = orjson.loads(response)
+        except Exception as e:
+            logger.debug("Batch translation failed: %s", e)
+            return None
+        
+        # Accept both the requested object and a bare array
+        translations = data.get("translations") if isinstance(data, dict) else data
+        if not isinstance(translations, list) or len(translations) != len(segments):
+            logger.debug("Batch translation returned an unexpected shape: %s", response)
+            return None
+        return [str(translation).strip() for translation in translations]
+
+    async def generate_translation(
+        self,
+        prompt: str,
+        model: str,
+        num_predict: Optional[int] = None,
+        response_format: Optional[str] = None,
+        system: Optional[str] = None
+    ) -> str:
         """
         Generate translation using Ollama
+        With a system message the request goes to /api/chat, where the constant instructions
+        can be reused across calls, otherwise to /api/generate
         
         Args:
-            prompt: Translation prompt
+            prompt: Translation prompt, or the user message when a system message is given
             model: Ollama model to use
+            num_predict: Optional cap on the number of generated tokens
+            response_format: Optional Ollama output format, e.g. "json"
+            system: Optional system message holding the translation instructions
             
         Returns:
             Generated translation text
@@ -646,30 +982,70 @@ Translate the following HTML content into Spanish.
             Exception: If translation fails
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                payload: object = {}
-                # print(f"DEBUG: PROMPT: {prompt}")
+            # print(f"DEBUG: PROMPT: {prompt}")
+            options: Dict[str, Any] = {"temperature": 0.3}  # Lower temperature for consistent translations
+            if num_predict is not None:
+                options["num_predict"] = num_predict
+            if system is not None:
+                endpoint = "/api/chat"
+                payload: Dict[str, Any] = {
+                    "model": OLLAMA_DEFAULT_MODEL,
+                    "messages": [
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt}
+                    ],
+                    "stream": True,
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
+                    "options": options
+                }
+            else:
+                endpoint = "/api/generate"
                 payload = {
                     "model": OLLAMA_DEFAULT_MODEL,
                     "prompt": prompt,
-                    "stream": False,
-                    "temperature": 0.3  # Lower temperature for consistent translations
+                    "stream": True,
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
+                    "options": options
                 }
-                
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json=payload
-                ) 
-                # //TODO change app before deploying
-                # response = await client.post("http://localhost:11434/api/generate", json=payload)
-
-                # print(f"DEBUG: Response status code: {response}")
-                response.raise_for_status()
-                # print(f"DEBUG: Response status code: {response.status_code}")
-                # print(f"DEBUG: Response headers: {response.headers}")
-                # print(f"DEBUG: Response content: {response.content}...")
-                data = response.json()
-                return data.get("response", "").strip()
+            if response_format is not None:
+                payload["format"] = response_format
+            
+            cache_key = hashlib.blake2b(
+                f"{OLLAMA_DEFAULT_MODEL}\0{response_format}\0{num_predict}\0{system}\0{prompt}".encode(), digest_size=16
+            ).digest()
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache_hits += 1
+                logger.debug("Translation cache hit (%s hits / %s misses)", self._cache_hits, self._cache_misses)
+                return cached
+            self._cache_misses += 1
+            
+            # Ollama streams one JSON object per line, collect the generated pieces as they arrive
+            parts: List[str] = []
+            async with self._sem:
+                async with self._client.stream("POST", endpoint, json=payload) as response:
+                    # //TODO change app before deploying
+                    # response = await client.post("http://localhost:11434/api/generate", json=payload)
+                    if response.is_error:
+                        await response.aread()  # Load the body so the error message can include it
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        data = orjson.loads(line)
+                        if "error" in data:
+                            raise Exception(f"Ollama API error: {data['error']}")
+                        # /api/generate streams "response" pieces, /api/chat streams "message" objects
+                        if "message" in data:
+                            parts.append(data["message"].get("content", ""))
+                        else:
+                            parts.append(data.get("response", ""))
+                        if data.get("done"):
+                            break
+            result = "".join(parts).strip()
+            if result:
+                self._cache[cache_key] = result
+            return result
                 
         except httpx.HTTPStatusError as e:
             raise Exception(f"Ollama API error: {e.response.status_code} - {e.response.text}")
@@ -683,7 +1059,7 @@ Translate the following HTML content into Spanish.
         resume = ""
         try:
             if language == "en":
-                    print(f"DEBUG: Original article text: {title}")
+                    logger.debug("Original article text: %s", title)
                     prompt = f"""You are an AI specialized in creating engaging article descriptions. Given the below blog title and slice of article body, generate a description that provides a clear idea of its content while encouraging readers to explore further. Rules: 
                     Always write in the same language as the original article. 
                     Style: neutral, professional, and clear. Avoid slang, exaggeration, or personal commentary.
@@ -692,9 +1068,9 @@ Translate the following HTML content into Spanish.
                     Length: A single paragraph of 30 to 40 words.
                 {"Title: " + title if title else "", " Article: " + body if body else ""}"""
                     resume = await self.generate_translation(prompt, model)
-                    print(f"DEBUG: Generated resume english: {resume}")
+                    logger.debug("Generated resume english: %s", resume)
             else:
-                   print(f"DEBUG: Original article text (ES): {title}")
+                   logger.debug("Original article text (ES): %s", title)
                    prompt = f"""Eres una IA especializada en crear descripciones atractivas de artículos. En función del título y el fragmento del cuerpo del artículo de blog al final de las instrucciones, genera una descripción que proporcione una idea clara de su contenido mientras anima a los lectores a explorar más. Reglas:
                    Siempre escribe en el mismo idioma que el artículo original.
                    Estilo: neutral, profesional y claro. Evita la jerga, la exageración o los comentarios personales.
@@ -703,12 +1079,12 @@ Translate the following HTML content into Spanish.
                    Longitud: un solo párrafo de 30 a 40 palabras.
                {"Titulo: " + title if title else "", " Artículo: " + body if body else ""}"""
                    resume = await self.generate_translation(prompt, model)
-                   print(f"DEBUG: Generated resume spanish: {resume}")
+                   logger.debug("Generated resume spanish: %s", resume)
         except httpx.HTTPStatusError as e:
             raise Exception(f"Ollama API error: {e.response.status_code} - {e.response.text}")
         except Exception as e:
             # Optionally log the error here
-            print(f"DEBUG: Error occurred while generating resume: {str(e)}")
+            logger.debug("Error occurred while generating resume: %s", e)
         return resume
 
 # Global service instance
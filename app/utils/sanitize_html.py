@@ -1,13 +1,134 @@
+"""
+HTML sanitization utilities
+Removes scripts, event handlers and javascript: URLs while keeping the rest of the markup
+"""
 import re
+from html import escape
+from html.entities import html5
+from html.parser import HTMLParser
+from typing import List, Optional, Tuple
+
+# Elements whose content is raw text and must be emitted without escaping
+_RAW_TEXT_TAGS = frozenset({'style'})
+# Attributes holding URLs that may carry a javascript: scheme
+_URL_ATTRS = frozenset({'href', 'src', 'action', 'formaction', 'xlink:href'})
+# Attributes whose value is parsed as a whole document
+_DOCUMENT_ATTRS = frozenset({'srcdoc'})
+# Attribute names are re-emitted only when they look like plain names
+_ATTR_NAME_RE = re.compile(r'[a-z_:][-a-z0-9_:.]*\Z')
+
+
+def _is_dangerous_attr(name: str, value: Optional[str]) -> bool:
+    """Event handlers (on*), srcdoc documents, javascript: URLs and malformed attribute names"""
+    if name.startswith('on') or name in _DOCUMENT_ATTRS or not _ATTR_NAME_RE.match(name):
+        return True
+    if name in _URL_ATTRS and value:
+        # Browsers ignore whitespace inside the scheme, so "java\tscript:" is still javascript
+        return ''.join(value.split()).lower().startswith('javascript:')
+    return False
+
+
+class _SanitizingParser(HTMLParser):
+    """
+    Single-pass parser that re-emits the markup without <script> elements and dangerous attributes
+    Comments, processing instructions and declarations are dropped, Python tokenizes them differently
+    than browsers do (e.g. "<!-->" or "--!>" end a comment in a browser), so echoing them isn't safe
+    """
+
+    def __init__(self, source: str) -> None:
+        # Keep entities as written, they are passed through by handle_entityref/handle_charref
+        super().__init__(convert_charrefs=False)
+        self.out: List[str] = []
+        self._in_script = False
+        self._in_raw_text = False
+        # Start offset of each source line, maps getpos() back to an index in the source
+        self._source = source
+        self._line_starts = [0] + [match.end() for match in re.finditer('\n', source)]
+
+    def _emit_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]], self_closing: bool) -> None:
+        # Always rebuilt from the parsed attributes, the raw tag text could smuggle markup inside a value
+        parts = ['<', tag]
+        for name, value in attrs:
+            if _is_dangerous_attr(name, value):
+                continue
+            if value is None:
+                parts.extend((' ', name))
+            else:
+                parts.extend((' ', name, '="', escape(value, quote=True), '"'))
+        parts.append(' />' if self_closing else '>')
+        self.out.append(''.join(parts))
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._in_script:
+            return
+        if tag == 'script':
+            self._in_script = True
+            return
+        self._emit_starttag(tag, attrs, self_closing=False)
+        if tag in _RAW_TEXT_TAGS:
+            self._in_raw_text = True
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._in_script or tag == 'script':
+            return
+        self._emit_starttag(tag, attrs, self_closing=True)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'script':
+            self._in_script = False
+            return
+        if self._in_script:
+            return
+        if tag in _RAW_TEXT_TAGS:
+            self._in_raw_text = False
+        self.out.append(f'</{tag}>')
+
+    def handle_data(self, data: str) -> None:
+        if self._in_script:
+            return
+        self.out.append(data if self._in_raw_text else escape(data, quote=False))
+
+    def handle_entityref(self, name: str) -> None:
+        if self._in_script:
+            return
+        if f'{name};' in html5:
+            self.out.append(f'&{name};')
+            return
+        # A bare "&" followed by a word ("AT&T") is also reported here, escape it and keep the
+        # ";" the parser consumed, if there was one
+        lineno, offset = self.getpos()
+        end = self._line_starts[lineno - 1] + offset + len(name) + 1
+        self.out.append(f'&amp;{name};' if self._source.startswith(';', end) else f'&amp;{name}')
+
+    def handle_charref(self, name: str) -> None:
+        if not self._in_script:
+            self.out.append(f'&#{name};')
+
+    def handle_comment(self, data: str) -> None:
+        pass
+
+    def handle_decl(self, decl: str) -> None:
+        pass
+
+    def handle_pi(self, data: str) -> None:
+        pass
+
+    def unknown_decl(self, data: str) -> None:
+        pass
+
+
 def sanitize_html(html: str) -> str:
-                # Remove <script> and other dangerous tags, but keep safe HTML structure
-                # Simple regex-based removal for <script> and event handlers
-                html = re.sub(r'<\s*script[^>]*>.*?<\s*/\s*script\s*>', '', html, flags=re.DOTALL|re.IGNORECASE)
-                # Remove on* event handlers (e.g., onclick, onerror)
-                html = re.sub(r'on\w+\s*=\s*"[^"]*"', '', html, flags=re.IGNORECASE)
-                html = re.sub(r'on\w+\s*=\s*\'[^\']*\'', '', html, flags=re.IGNORECASE)
-                html = re.sub(r'on\w+\s*=\s*[^ >]+', '', html, flags=re.IGNORECASE)
-                # Remove javascript: in href/src
-                html = re.sub(r'(href|src)\s*=\s*"javascript:[^"]*"', '', html, flags=re.IGNORECASE)
-                html = re.sub(r'(href|src)\s*=\s*\'javascript:[^\']*\'', '', html, flags=re.IGNORECASE)
-                return html
\ No newline at end of file
+    """
+    Remove <script> elements, on* event handlers, javascript: URLs and comments from HTML
+    Runs in a single linear pass, so adversarial input can't trigger regex backtracking
+
+    Args:
+        html: HTML content to sanitize
+
+    Returns:
+        HTML with the dangerous parts removed and the remaining structure preserved
+    """
+    parser = _SanitizingParser(html)
+    parser.feed(html)
+    parser.close()
+    return ''.join(parser.out)
@@ -4,6 +4,11 @@ Cleans and processes text responses from Ollama before sending to client
 """
 import re
 
+# Patterns compiled once at import instead of on every call
+# Script blocks and any other tag, matched in a single scan (tags may span lines)
+_MARKUP_RE = re.compile(r'<script.*?</script>|<.*?>', re.IGNORECASE | re.DOTALL)
+_WS_RE = re.compile(r'\s+')
+
 
 def sanitize_text(text: str) -> str:
     """
@@ -18,17 +23,8 @@ def sanitize_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove leading/trailing whitespace
-    text = text.strip()
-    
-    # Remove any potential injection attempts (basic sanitization)
-    text = re.sub(r'<script.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r'<.*?>', '', text)  # Remove HTML tags
-    
-    # Remove excessive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    # Remove any potential injection attempts (basic sanitization): script blocks and HTML tags
+    text = _MARKUP_RE.sub('', text)
     
-    return text
+    # Collapse whitespace (newlines included) and remove leading/trailing whitespace
+    return _WS_RE.sub(' ', text).strip()
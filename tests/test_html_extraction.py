@@ -0,0 +1,56 @@
+"""
+Parity between the selectolax and BeautifulSoup text extraction walkers
+"""
+import unittest
+from unittest.mock import patch
+
+import app.utils.ollama_services as ollama_services
+from app.utils.ollama_services import ollama_service
+
+_WELL_FORMED_FRAGMENTS = [
+    '<p>Hello <b>bold</b> world</p>',
+    '<div class="a b"><h1>Title</h1><ul><li>one</li><li>two</li></ul></div>',
+    '<img src="a.png" alt="Dog" title="A dog"><br>text',
+    'plain text',
+    '<title>Page</title><p>body</p>',
+    '<a href="/x?a=1&amp;b=2">link</a>',
+    '<p>Use &lt;b&gt; for bold &amp; more</p>',
+]
+
+_TABLE_FRAGMENTS = [
+    '<tr><td>Hello</td><td>World</td></tr>',
+    '<table><tr><td>a</td></tr></table>',
+    '<thead><tr><th>Head</th></tr></thead>',
+    '<caption>Caption</caption>',
+    '<p>a</p><colgroup><col span="2" /></colgroup>',
+]
+
+
+def _round_trip(html: str):
+    text_segments, structure_map = ollama_service.extract_text_with_structure(html)
+    return text_segments, ollama_service.reconstruct_html_from_structure(text_segments, structure_map)
+
+
+@unittest.skipIf(ollama_services.LexborHTMLParser is None, 'selectolax is not installed')
+class ExtractionParityTest(unittest.TestCase):
+
+    def test_walkers_agree_on_well_formed_fragments(self):
+        for html in _WELL_FORMED_FRAGMENTS:
+            with self.subTest(html=html):
+                text_segments, structure_map = ollama_service._extract_text_with_selectolax(html)
+                selectolax_result = (text_segments, ollama_service.reconstruct_html_from_structure(text_segments, structure_map))
+                with patch.object(ollama_services, 'LexborHTMLParser', None):
+                    beautifulsoup_result = _round_trip(html)
+                self.assertEqual(selectolax_result, beautifulsoup_result)
+
+    def test_table_markup_keeps_its_structure(self):
+        for html in _TABLE_FRAGMENTS:
+            with self.subTest(html=html):
+                with patch.object(ollama_services, 'LexborHTMLParser', None):
+                    beautifulsoup_result = _round_trip(html)
+                self.assertEqual(_round_trip(html), beautifulsoup_result)
+                self.assertEqual(beautifulsoup_result[1], html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Batched HTML translation with a stubbed Ollama call
+"""
+import unittest
+from typing import List, Optional
+from unittest.mock import patch
+
+from app.utils.ollama_services import ollama_service
+
+_TEST_HTML = '<div><h1>Hello</h1><p>World</p><img src="a.png" alt="Dog"></div>'
+
+
+class TranslateHtmlContentBatchedTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_translates_all_segments_in_one_call(self):
+        prompts: List[str] = []
+
+        async def fake_generate(prompt: str, model: str, num_predict: Optional[int] = None,
+                                response_format: Optional[str] = None, system: Optional[str] = None) -> str:
+            prompts.append(prompt)
+            return prompt.upper()  # Keeps the [[i]] markers and separators
+
+        with patch.object(ollama_service, 'generate_translation', side_effect=fake_generate):
+            result = await ollama_service.translate_html_content_batched(_TEST_HTML, 'Spanish', 'test-model')
+
+        self.assertEqual(len(prompts), 1)
+        self.assertEqual(result, '<div><h1>HELLO</h1><p>WORLD</p><img src="a.png" alt="DOG" /></div>')
+
+    async def test_falls_back_to_one_call_per_segment_on_count_mismatch(self):
+        prompts: List[str] = []
+
+        async def fake_generate(prompt: str, model: str, num_predict: Optional[int] = None,
+                                response_format: Optional[str] = None, system: Optional[str] = None) -> str:
+            prompts.append(prompt)
+            if response_format == 'json':
+                return '{"translations": ["only one"]}'  # Wrong number of items
+            if prompt.startswith('Translate this text'):
+                return prompt.rsplit(': ', 1)[1].upper()
+            return 'a single merged translation'  # Segment markers and separators lost
+
+        with patch.object(ollama_service, 'generate_translation', side_effect=fake_generate):
+            result = await ollama_service.translate_html_content_batched(_TEST_HTML, 'Spanish', 'test-model')
+
+        # Joined prompt, JSON batch retry, then one call for each of the three segments
+        self.assertEqual(len(prompts), 5)
+        self.assertEqual(result, '<div><h1>HELLO</h1><p>WORLD</p><img src="a.png" alt="DOG" /></div>')
+
+    async def test_keeps_escaped_text_escaped(self):
+        async def fake_generate(prompt: str, model: str, num_predict: Optional[int] = None,
+                                response_format: Optional[str] = None, system: Optional[str] = None) -> str:
+            return prompt  # Translation leaves the text as is
+
+        html = '<p>Use &lt;img src=x onerror=alert(1)&gt; carefully</p><p>A &amp; B</p>'
+        with patch.object(ollama_service, 'generate_translation', side_effect=fake_generate):
+            result = await ollama_service.translate_html_content_batched(html, 'Spanish', 'test-model')
+
+        self.assertEqual(result, html)
+
+    async def test_returns_markup_without_text_unchanged(self):
+        with patch.object(ollama_service, 'generate_translation') as generate:
+            result = await ollama_service.translate_html_content_batched('<div><br></div>', 'Spanish', 'test-model')
+
+        generate.assert_not_called()
+        self.assertEqual(result, '<div><br></div>')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Regression cases for the HTML sanitizer
+"""
+import unittest
+
+from app.utils.sanitize_html import sanitize_html
+
+
+class SanitizeHtmlTest(unittest.TestCase):
+
+    def test_removes_script_elements(self):
+        self.assertEqual(sanitize_html('<p>a</p><script>alert(1)</script><p>b</p>'), '<p>a</p><p>b</p>')
+
+    def test_removes_unterminated_script(self):
+        self.assertEqual(sanitize_html('<p>ok</p><script>alert(1)'), '<p>ok</p>')
+
+    def test_removes_event_handlers(self):
+        self.assertEqual(sanitize_html('<img src="x.png" onerror="alert(1)" alt="a">'), '<img src="x.png" alt="a">')
+        self.assertEqual(sanitize_html('<p ONCLICK="x">t</p>'), '<p>t</p>')
+
+    def test_removes_javascript_urls(self):
+        self.assertEqual(sanitize_html('<a href="javascript:alert(1)">x</a>'), '<a>x</a>')
+        self.assertEqual(sanitize_html('<a href=" JaVa\nscript:x" title="t">y</a>'), '<a title="t">y</a>')
+
+    def test_removes_entity_encoded_javascript_urls(self):
+        self.assertEqual(sanitize_html('<a href="java&#x09;script:alert(1)">x</a>'), '<a>x</a>')
+        self.assertEqual(sanitize_html('<img src="&#106;avascript:alert(1)">'), '<img>')
+
+    def test_keeps_safe_markup(self):
+        html = '<div class="a"><a href="https://example.com/?a=1&amp;b=2">x</a><br /></div>'
+        self.assertEqual(sanitize_html(html), html)
+        self.assertEqual(sanitize_html("<p class='a' hidden>t</p>"), '<p class="a" hidden>t</p>')
+
+    def test_removes_other_url_attributes_and_srcdoc(self):
+        self.assertEqual(sanitize_html('<form action="javascript:x"><button formaction="javascript:y">b</button></form>'),
+                         '<form><button>b</button></form>')
+        self.assertEqual(sanitize_html('<svg><a xlink:href="javascript:x">a</a></svg>'), '<svg><a>a</a></svg>')
+        self.assertEqual(sanitize_html('<iframe srcdoc="<script>alert(1)</script>"></iframe>'), '<iframe></iframe>')
+
+    def test_escapes_markup_hidden_in_attribute_values(self):
+        self.assertEqual(
+            sanitize_html('<noscript><p title="</noscript><img src=x onerror=alert(1)>"></noscript>'),
+            '<noscript><p title="&lt;/noscript&gt;&lt;img src=x onerror=alert(1)&gt;"></noscript>'
+        )
+
+    def test_drops_comments(self):
+        self.assertEqual(sanitize_html('<p>a<!-- note -->b</p>'), '<p>ab</p>')
+        self.assertNotIn('<script', sanitize_html('<!--><script>alert(1)</script>-->'))
+        self.assertNotIn('<script', sanitize_html('<!-- --!><script>alert(1)</script> -->'))
+        self.assertNotIn('onerror', sanitize_html('<!---><img src=x onerror=alert(1)>-->'))
+
+    def test_keeps_entities_as_written(self):
+        html = '<p>a&nbsp;b &copy; &#169; &#xA9; &amp; &lt;</p>'
+        self.assertEqual(sanitize_html(html), html)
+
+    def test_escapes_bare_ampersands(self):
+        self.assertEqual(sanitize_html('<p>AT&T & co</p>'), '<p>AT&amp;T &amp; co</p>')
+
+    def test_keeps_semicolon_of_unknown_entities(self):
+        self.assertEqual(sanitize_html('<p>&unknown; &T;\nx &zz;</p>'), '<p>&amp;unknown; &amp;T;\nx &amp;zz;</p>')
+
+    def test_drops_cdata_and_processing_instructions(self):
+        self.assertEqual(sanitize_html('a<![CDATA[x]]>b<?php echo 1 ?>c'), 'abc')
+
+    def test_keeps_style_content_raw(self):
+        self.assertEqual(sanitize_html('<style>a > b {}</style>'), '<style>a > b {}</style>')
+
+
+if __name__ == '__main__':
+    unittest.main()